@@ -1,8 +1,18 @@
 from random import randint
 import random as rd
+
+import numpy as np
+
 import src.utils.Constants as const
+from src.utils.Constants import RNG
 from src.genetic.Genome import Genome
 
+# The compiled kernel is optional, see src/genetic/_ops.pyx for how to build it
+try:
+    from src.genetic._ops import two_point_crossover_c
+except ImportError:
+    two_point_crossover_c = None
+
 """
 Author Theodoros Giannilias & Guillaume Franzoni Darnois
 """
@@ -39,6 +49,23 @@ def two_point_crossover(genome_1: Genome, genome_2: Genome) -> Genome:
                 new_genes.append(genome_1.genes[i])
     return Genome(new_genes)
 
+#  Two-Point Crossover Operation on a batch of parents, one pair per row
+def two_point_crossover_batch(genes_1: np.ndarray, genes_2: np.ndarray) -> np.ndarray:
+    n, length = genes_1.shape
+    first_point = RNG.integers(0, length + 1, size = (n, 1))
+    second_point = RNG.integers(first_point, length + 1)
+    # Randomly decide which parent gives the outer and which the inner part
+    swap = RNG.random((n, 1)) < 0.5
+    if two_point_crossover_c is not None:
+        children = np.empty_like(genes_1)
+        two_point_crossover_c(np.ascontiguousarray(genes_1), np.ascontiguousarray(genes_2), first_point.ravel(),
+                              second_point.ravel(), swap.ravel().view(np.uint8), children)
+        return children
+    outer = np.where(swap, genes_2, genes_1)
+    inner = np.where(swap, genes_1, genes_2)
+    positions = np.arange(length)
+    return np.where((positions >= first_point) & (positions <= second_point), inner, outer)
+
 # Multi-Point Crossover Operation
 def multi_point_crossover(genome_1: Genome, genome_2: Genome) -> Genome:
     num_of_points = randint(0, const.GENOME_LENGTH)
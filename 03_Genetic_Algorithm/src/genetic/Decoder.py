@@ -1,6 +1,7 @@
 from typing import List
 
 import numpy as np
+from numba import njit
 
 from src.genetic.Genome import Genome
 from src.simulator.Sensors import Sensors
@@ -14,6 +15,23 @@ def optimization_decoder(genome: Genome) -> np.ndarray:
     return np.sum(np.array(genome.genes).reshape((int(len(genome.genes)/VALUES_PER_AXIS), VALUES_PER_AXIS)), axis=1) / VALUES_PER_AXIS
 
 
+def optimization_decoder_batch(genes: np.ndarray) -> np.ndarray:
+    return decode_genes(genes, VALUES_PER_AXIS)
+
+
+@njit(cache=True, fastmath=True)
+def decode_genes(genes: np.ndarray, values_per_axis: int) -> np.ndarray:
+    n_axis = genes.shape[1] // values_per_axis
+    coordinates = np.empty((genes.shape[0], n_axis), dtype=np.float32)
+    for i in range(genes.shape[0]):
+        for axis in range(n_axis):
+            value = 0.0
+            for j in range(axis * values_per_axis, (axis + 1) * values_per_axis):
+                value += genes[i, j]
+            coordinates[i, axis] = value / values_per_axis
+    return coordinates
+
+
 def robot_decoder(genome: Genome, sensors: Sensors, prev_vel: List[float]) -> (float, float):
     # TODO The velocity should feed back into the NN like a RNN 
 
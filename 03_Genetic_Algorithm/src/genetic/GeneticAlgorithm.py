@@ -1,25 +1,81 @@
-import random
-from typing import List
+import os
+from multiprocessing import Process, Queue
+from queue import Empty
 
 import numpy as np
+from numba import njit
+from numpy.random import default_rng
 
 from src.genetic import Crossover, Mutations
-from src.genetic.Decoder import optimization_decoder
+from src.genetic.Decoder import optimization_decoder_batch
 from src.genetic.Genome import Genome
 from src.genetic.Population import Population
 from src.optimization_function.Visualizer import Visualizer
 from src.simulator.Simulator import Simulator
-from src.utils.Constants import N_GENERATION, ELITISM_PERCENTAGE, SELECT_PERCENTAGE, N_INDIVIDUALS, DRAW, OPTI_FUNC, CROSSOVER_MUTATION_PERCENTAGE, VALUES_PER_AXIS, MUTATION_PROBABILITY
+from src.utils.Constants import N_GENERATION, ELITE_N, SELECT_N, XMUT_N, DRAW, OPTI_FUNC, OPTI_FUNC_VEC, VALUES_PER_AXIS, MUTATION_PROBABILITY, N_SWARMS, MIGRATION_INTERVAL, MIGRATION_SIZE, N_INDIVIDUALS, DIMENSION, RNG
 from src.utils.DataVisualizer import DataManager
 
+# One record per evaluated individual and generation, read by the Visualizer
+HISTORY_DTYPE = np.dtype([('id', 'i4'), ('alt', 'f4'), ('best', '?'), ('pos', 'f4', (DIMENSION,)), ('vel', 'f4'), ('swarm', 'i2')])
+
+
+def evaluate_chunk(genes: np.ndarray) -> (np.ndarray, np.ndarray):
+    # Decodes and evaluates a whole gene matrix at once, also used by the island processes
+    coordinates = optimization_decoder_batch(genes)
+    return coordinates, OPTI_FUNC_VEC(coordinates)
+
+
+@njit(cache=True)
+def fitness_stats(fitness: np.ndarray) -> (float, float, float):
+    # Average, best and diversity (mean absolute difference of neighbours) in a single pass
+    total = fitness[0]
+    best = fitness[0]
+    diversity = 0.0
+    for i in range(1, fitness.size):
+        total += fitness[i]
+        best = min(best, fitness[i])
+        diversity += abs(fitness[i] - fitness[i - 1])
+    return total / fitness.size, best, diversity / (fitness.size - 1)
+
+
+class _AliasSampler:
+    """
+    Walker's alias method, built in O(N) once and then draws every index in O(1)
+    """
+
+    def __init__(self, probs: np.ndarray):
+        n = len(probs)
+        self.prob: np.ndarray = np.ones(n)              # Probability of keeping the drawn column
+        self.alias: np.ndarray = np.arange(n)           # Index returned when the column is not kept
+        scaled = probs * (n / probs.sum())
+        small = [i for i in range(n) if scaled[i] < 1]
+        large = [i for i in range(n) if scaled[i] >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.prob[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] += scaled[less] - 1
+            (small if scaled[more] < 1 else large).append(more)
+
+    def sample(self, n: int) -> np.ndarray:
+        columns = RNG.integers(0, len(self.prob), size = n)
+        return np.where(RNG.random(n) < self.prob[columns], columns, self.alias[columns])
+
+
+def run_island(island: int, inbox: Queue, outbox: Queue, results: Queue):
+    # Forked islands would otherwise all share the same random stream, the shared generator is reseeded in place
+    RNG.bit_generator.state = default_rng(os.getpid()).bit_generator.state
+    GeneticAlgorithm(island = island).evolve_island(inbox, outbox, results)
+
 
 class GeneticAlgorithm:
     """
     Author Frederic Abraham
     """
 
-    def __init__(self, robot: bool = False):
+    def __init__(self, robot: bool = False, island: int = None):
         self.emergency_break = False
+        self.island = island  # Index of the island when this instance is a worker of the island model
         self.display_data = dict(
             avg_fitness = dict(display_name = 'avg fitness',  value = 0, graph = True),
             best_fitness = dict(display_name = 'best fitness',  value = 0, graph = True),
@@ -27,16 +83,22 @@ class GeneticAlgorithm:
             generation = dict(display_name = 'generation',  value = 0, graph = False),
         )
 
-        self.data_manager: DataManager = DataManager(data_names = [
-            display_name['display_name'] for display_name in list(filter(lambda ele: ele['graph'], self.display_data.values()))
-        ], parallel = False, visualize=False)
+        if self.island is None:
+            self.data_manager: DataManager = DataManager(data_names = [
+                display_name['display_name'] for display_name in list(filter(lambda ele: ele['graph'], self.display_data.values()))
+            ], parallel = False, visualize=False)
 
         self.robot = robot
         if self.robot:
             self.sim = Simulator(display_data = self.display_data, simulation_time = 50, gui_enabled = DRAW, stop_callback = self.stop)
+        elif self.island is None:
+            evaluate_chunk(Population().genes)  # Compile the numba kernels before the islands are forked
 
-        self.populations: List[Population] = []
-        self.history = {i: [] for i in range(0, N_GENERATION)}
+        self.best_fitness_history: np.ndarray = np.full(N_GENERATION, np.nan)  # Best fitness per generation, plotted by the Visualizer as log
+        self.history: np.ndarray = None  # Islands only send their results, the history is kept by the main process
+        if self.island is None:
+            n_recorded = N_INDIVIDUALS if self.robot or N_SWARMS == 1 else N_INDIVIDUALS * N_SWARMS
+            self.history = np.zeros((N_GENERATION, n_recorded), dtype = HISTORY_DTYPE)
 
         self.generation = 0
         self.avg_fitness = [-1]
@@ -45,46 +107,116 @@ class GeneticAlgorithm:
         self.test_name = "sim"
         self.func_name = "Rosenbrock"
         self.crossover_str = "two_point_crossover"
-        self.crossover_func = Crossover.two_point_crossover
+        self.crossover_func = Crossover.two_point_crossover_batch
         self.mutation_str = "gaussian"
-        self.mutation = Mutations.gaussian
+        self.mutation = Mutations.gaussian_batch
         self.title = f"Genetic Algorithm - crossover: {self.crossover_str} with {VALUES_PER_AXIS} Values per axis and {self.mutation_str} mutation with {MUTATION_PROBABILITY} probability - {self.func_name}"
         self.write_title = f"{self.test_name.replace(' ', '_')}_{self.func_name}_{self.crossover_str.replace(' ', '_')}"
 
     def run(self):
+        if self.robot or N_SWARMS == 1:
+            self.run_population()
+        else:
+            self.run_islands()
+
+        self.data_manager.stop()
+
+        viz = Visualizer(OPTI_FUNC, self.history, self.title,
+                      dict(
+                        avg_fitness = np.log(self.data_manager.get_data("avg fitness")),
+                        best_fitness = np.log(self.best_fitness_history[:self.generation]),
+                        diversity = np.log(self.data_manager.get_data("diversity")),
+                      ))
+        print("Viz Done")
+        viz.show_fig()
+        viz.write_fig(self.write_title.lower())
 
+    def run_population(self):
+        # Two preallocated populations, the next generation is written into the one not being evaluated
         population = Population()
+        next_population = Population(np.empty_like(population.genes))
         for generation in range(1, N_GENERATION + 1):
             if self.emergency_break:
                 break
 
             self.generation = generation
 
-            self.populations.append(population)
-
             self.evaluation(population)
-            self.update_data(generation, population)
+            self.update_data(generation, population.fitness)
 
-            next_population = self.selection()
-            self.crossover_mutation(next_population)
-            self.generate_new(next_population)
+            self.reproduction(population, next_population.genes)
 
             # for i in range(5):
-            #     print(next_population[-i].genes)
-
-            population = Population(next_population)
+            #     print(next_population.genes[-i])
+
+            population, next_population = next_population, population
+
+    def run_islands(self):
+        # Every island is a process evolving its own population, the best individuals migrate along a ring
+        inboxes = [Queue() for _ in range(N_SWARMS)]
+        results = Queue()
+        islands = [
+            Process(target = run_island, args = (island, inboxes[island], inboxes[(island + 1) % N_SWARMS], results))
+            for island in range(N_SWARMS)
+        ]
+        for island in islands:
+            island.start()
+
+        # Islands report every generation, the data is only updated once all of them reached it
+        pending = {generation: [] for generation in range(1, N_GENERATION + 1)}
+        generation = 1
+        completed = False
+        try:
+            for _ in range(N_GENERATION * N_SWARMS):
+                island_result = self.next_island_result(islands, results)
+                if island_result is None:
+                    break
+                pending[island_result[1]].append(island_result)
+                while generation <= N_GENERATION and len(pending[generation]) == N_SWARMS:
+                    self.generation = generation
+                    island_results = sorted(pending.pop(generation), key = lambda result: result[0])
+                    for island, _, coordinates, altitudes, _ in island_results:
+                        self.record_history(coordinates, altitudes, island, island * N_INDIVIDUALS)
+                    self.update_data(generation, np.concatenate([fitness for *_, fitness in island_results]))
+                    generation += 1
+            else:
+                completed = True
+        finally:
+            # Stopped or failed islands would otherwise keep waiting for migrants forever
+            for island in islands:
+                if not completed:
+                    island.terminate()
+                island.join()
+
+    def next_island_result(self, islands: list, results: Queue):
+        # Next result sent by any island, None if the run was stopped
+        while not self.emergency_break:
+            try:
+                return results.get(timeout = 1)
+            except Empty:
+                failed = [island.exitcode for island in islands if island.exitcode not in (None, 0)]
+                if failed or not any(island.is_alive() for island in islands):
+                    raise RuntimeError(f"Island processes stopped before sending all their results, exit codes: {failed}")
+        return None
+
+    def evolve_island(self, inbox: Queue, outbox: Queue, results: Queue):
+        population = Population()
+        next_population = Population(np.empty_like(population.genes))
+        for generation in range(1, N_GENERATION + 1):
+            coordinates, altitudes = evaluate_chunk(population.genes)
+            population.fitness[:] = np.where(altitudes == 0, 0.00000001, altitudes)
+            results.put((self.island, generation, coordinates, altitudes, population.fitness.copy()))
 
-        self.data_manager.stop()
+            if generation % MIGRATION_INTERVAL == 0:
+                # Send the best to the next island and replace the worst with the ones received
+                ordered_idx = np.argsort(population.fitness)
+                outbox.put((population.genes[ordered_idx[:MIGRATION_SIZE]], population.fitness[ordered_idx[:MIGRATION_SIZE]]))
+                migrant_genes, migrant_fitness = inbox.get()
+                population.genes[ordered_idx[-MIGRATION_SIZE:]] = migrant_genes
+                population.fitness[ordered_idx[-MIGRATION_SIZE:]] = migrant_fitness
 
-        viz = Visualizer(OPTI_FUNC, self.history, self.title,
-                      dict(
-                        avg_fitness = np.log(self.data_manager.get_data("avg fitness")),
-                        best_fitness = np.log(self.data_manager.get_data("best fitness")),
-                        diversity = np.log(self.data_manager.get_data("diversity")),
-                      ))
-        print("Viz Done")
-        viz.show_fig()
-        viz.write_fig(self.write_title.lower())
+            self.reproduction(population, next_population.genes)
+            population, next_population = next_population, population
 
 
     def evaluation(self, population: Population):
@@ -98,69 +230,68 @@ class GeneticAlgorithm:
         self.sim.start()
 
     def optimisation_evaluation(self, population):
-        individuals = population.individuals
-        for i, individual in enumerate(individuals):
-            coordinates = optimization_decoder(individual)
-            altitude = OPTI_FUNC(coordinates)
-            individual.set_fitness(0.00000001 if altitude == 0 else altitude)
-            self.history.get(self.generation - 1).append(
-                dict(
-                    id=i,
-                    alt=altitude,
-                    best=False,
-                    pos=coordinates,
-                    vel=0,
-                    swarm=1
-                )
-            )
-
-    def selection(self) -> List[Genome]:
-        next_population = []
-        ordered_by_fitness = list(sorted(self.populations[-1].individuals, key=lambda genome: genome.fitness, reverse=True))
-        fitness = [individual.fitness for individual in ordered_by_fitness]
-
-        # Select first n as elite
-        for i in range(1, int(N_INDIVIDUALS * ELITISM_PERCENTAGE) + 1):
-            best_genome = ordered_by_fitness[-i]
-            next_population.append(best_genome)
-
-        weights = np.reciprocal(fitness)  # Invert all weights
-        weights = weights / np.sum(weights)  # Normalize
-        # Do roulette wheel selection
-        for i in range(int(N_INDIVIDUALS * SELECT_PERCENTAGE)):
-            choice = np.random.choice(ordered_by_fitness, p = weights)
-            next_population.append(choice)  # Sample
-
-        return next_population
-
-    def crossover_mutation(self, next_population: List):
-        for i in range(int(N_INDIVIDUALS * CROSSOVER_MUTATION_PERCENTAGE)):
-            parent1 = random.sample(next_population, 1)[0]
-            parent2 = random.sample(next_population, 1)[0]
-            child = self.crossover_func(parent1, parent2)
-
-            child = self.mutation(child)
-
-            next_population.append(child)
-
-    def generate_new(self, next_population):
-        while len(next_population) < N_INDIVIDUALS:
-            next_population.append(Genome())
+        # Evaluated inline, the batched kernels take microseconds which is far less than a process pool round trip
+        coordinates, altitudes = evaluate_chunk(population.genes)
+        population.fitness[:] = np.where(altitudes == 0, 0.00000001, altitudes)
+        self.record_history(coordinates, altitudes, 1)
+
+    def record_history(self, coordinates: np.ndarray, altitudes: np.ndarray, swarm: int, start: int = 0):
+        history = self.history[self.generation - 1, start:start + len(altitudes)]
+        history['id'] = np.arange(start, start + len(altitudes))
+        history['alt'] = altitudes
+        history['pos'] = coordinates
+        history['swarm'] = swarm
+
+    def reproduction(self, population: Population, next_genes: np.ndarray):
+        # Every step writes into the next genes starting at the index the previous one stopped at
+        write_idx = self.selection(population, next_genes, 0)
+        write_idx = self.crossover_mutation(next_genes, write_idx)
+        self.generate_new(next_genes, write_idx)
+
+    # Module constants and functions are bound as default arguments in the per-generation methods, so they are
+    # fast local lookups instead of global lookups
+    def selection(self, population: Population, next_genes: np.ndarray, write_idx: int,
+                  _E=ELITE_N, _S=SELECT_N, _argpartition=np.argpartition, _concatenate=np.concatenate) -> int:
+        fitness = population.fitness
+
+        # Select the n best (lowest) fitness as elite, their order among each other does not matter
+        elite_idx = _argpartition(fitness, _E)[:_E]
+
+        weights = 1.0 / fitness  # Invert all weights
+        weights *= 1.0 / weights.sum()  # Normalize
+        # Do roulette wheel selection, the weights are aligned with the individuals so no sorting is needed
+        sampler = _AliasSampler(weights)
+        selected_idx = sampler.sample(_S)
+
+        next_idx = write_idx + _E + _S
+        next_genes[write_idx:next_idx] = population.genes[_concatenate((elite_idx, selected_idx))]
+        return next_idx
+
+    def crossover_mutation(self, next_genes: np.ndarray, write_idx: int, _X=XMUT_N, _integers=RNG.integers) -> int:
+        # All parent pairs are drawn at once and the children are created in one batch
+        pairs = _integers(0, write_idx, size = (_X, 2))
+        children = self.crossover_func(next_genes[pairs[:, 0]], next_genes[pairs[:, 1]])
+        children = self.mutation(children)
+
+        next_genes[write_idx:write_idx + _X] = children
+        return write_idx + _X
+
+    def generate_new(self, next_genes: np.ndarray, write_idx: int, _init_genomes=Genome.init_genomes) -> int:
+        next_genes[write_idx:] = _init_genomes(len(next_genes) - write_idx)
+        return len(next_genes)
 
     def stop(self):
         self.emergency_break = True
         self.data_manager.stop()
 
-    def update_data(self, generation, population):
-        individuals = population.individuals
-
-        individual_fitness = [x.fitness for x in individuals]
-
+    def update_data(self, generation, fitness: np.ndarray, _fitness_stats=fitness_stats):
         self.data_manager.update_time_step(generation)
         self.display_data['generation']['value'] = generation
-        self.display_data['avg_fitness']['value'] = np.mean(individual_fitness)
-        self.display_data['best_fitness']['value'] = np.min(individual_fitness)
-        self.display_data['diversity']['value'] = np.mean(np.abs(np.diff(individual_fitness)))
+        avg_fitness, best_fitness, diversity = _fitness_stats(fitness)
+        self.display_data['avg_fitness']['value'] = avg_fitness
+        self.display_data['best_fitness']['value'] = best_fitness
+        self.best_fitness_history[generation - 1] = best_fitness
+        self.display_data['diversity']['value'] = diversity
 
         for data in self.display_data.values():
             if 'graph' in data and data['graph']:
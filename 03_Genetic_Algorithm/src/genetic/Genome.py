@@ -3,7 +3,7 @@ import numpy as np
 
 from typing import List
 
-from src.utils.Constants import VALUES_PER_AXIS, DIMENSION, MAX_POS, MIN_POS
+from src.utils.Constants import VALUES_PER_AXIS, DIMENSION, MAX_POS, MIN_POS, RNG
 
 
 class Genome:
@@ -23,7 +23,12 @@ class Genome:
     @staticmethod
     def init_genome():
         # return list(np.repeat(np.random.uniform(low = MAX_POS - (MAX_POS / 3), high = MAX_POS, size = (DIMENSION, 1)), VALUES_PER_AXIS))  # np.random.rand(GENOME_LENGTH) * 0.1
-        return list(np.repeat(np.random.uniform(low = MIN_POS, high = MAX_POS, size = (DIMENSION, 1)), VALUES_PER_AXIS))  # np.random.rand(GENOME_LENGTH) * 0.1
+        return list(np.repeat(RNG.uniform(low = MIN_POS, high = MAX_POS, size = (DIMENSION, 1)), VALUES_PER_AXIS))  # np.random.rand(GENOME_LENGTH) * 0.1
+
+    @staticmethod
+    def init_genomes(n: int) -> np.ndarray:
+        # Same as init_genome but for n genomes at once, one per row
+        return np.repeat(RNG.uniform(low = MIN_POS, high = MAX_POS, size = (n, DIMENSION)), VALUES_PER_AXIS, axis = 1)
 
     def get_fitness(self):
         return self.fitness
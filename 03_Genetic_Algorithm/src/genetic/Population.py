@@ -1,5 +1,8 @@
+import math
 from typing import List
 
+import numpy as np
+
 import src.utils.Constants as Const
 from src.genetic.Genome import Genome
 
@@ -9,8 +12,13 @@ class Population:
     Author Frederic Abraham
     """
 
-    def __init__(self, individuals: List = None):
-        if individuals is None:
-            self.individuals: List[Genome] = [Genome() for _ in range(Const.N_INDIVIDUALS)]
-        else:
-            self.individuals: List[Genome] = individuals
+    def __init__(self, genes: np.ndarray = None):
+        if genes is None:
+            genes = Genome.init_genomes(Const.N_INDIVIDUALS)
+        self.genes: np.ndarray = genes                              # One row of genes per individual
+        self.fitness: np.ndarray = np.full(len(genes), math.nan)    # Fitness of every individual, same order as genes
+
+    @property
+    def individuals(self) -> List[Genome]:
+        # Genomes are only views on the rows of the gene array
+        return [Genome(genes) for genes in self.genes]
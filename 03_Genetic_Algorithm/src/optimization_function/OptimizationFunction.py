@@ -2,6 +2,7 @@ from enum import Enum
 
 import numpy as np
 import math
+from numba import njit
 
 ackley_height = 20
 
@@ -19,6 +20,12 @@ class OptimizationFunction:
             [self.b * (pos[i + 1] - pos[i] ** 2) ** 2 + (self.a - pos[i]) ** 2 for i in range(0, len(pos) - 1)]
         )
 
+    def rosenbrock_batch(self, pos: np.ndarray) -> np.ndarray:
+        """
+        Rosenbrock evaluated on a (N, DIMENSION) array of positions, one altitude per row
+        """
+        return rosenbrock_kernel(pos, self.a, self.b)
+
     def rastrigin(self, pos: np.ndarray):
         return 10 * len(pos) + np.sum(pos ** 2 - 10 * np.cos(2 * math.pi * pos))
 
@@ -45,3 +52,14 @@ class OptimizationFunction:
 
     def reverse_ackley2(self, pos: np.ndarray):
         return self.ackley2(pos) * -1
+
+
+@njit(cache=True, fastmath=True)
+def rosenbrock_kernel(pos: np.ndarray, a: float, b: float) -> np.ndarray:
+    altitudes = np.empty(pos.shape[0])
+    for i in range(pos.shape[0]):
+        altitude = 0.0
+        for d in range(pos.shape[1] - 1):
+            altitude += b * (pos[i, d + 1] - pos[i, d] ** 2) ** 2 + (a - pos[i, d]) ** 2
+        altitudes[i] = altitude
+    return altitudes
@@ -16,7 +16,7 @@ class Visualizer:
     Author = Frederic Abraham
     """
 
-    def __init__(self, opti_func: Callable[[np.ndarray], float], data: Dict = None, title: str = None,
+    def __init__(self, opti_func: Callable[[np.ndarray], float], data: np.ndarray = None, title: str = None,
                  line_data: Dict = None):
 
         # Read data from a csv
@@ -37,16 +37,16 @@ class Visualizer:
 
         fig = fig.add_trace(
             go.Scatter3d(
-                x=[data.get(0)[i].get("pos")[0] for i in range(len(data.get(0)))],
-                y=[data.get(0)[i].get("pos")[1] for i in range(len(data.get(0)))],
-                z=[data.get(0)[i].get("alt") for i in range(len(data.get(0)))],
-                hovertext=[f'team {data.get(0)[i].get("swarm")}' for i in range(len(data.get(0)))],
+                x=data[0]["pos"][:, 0],
+                y=data[0]["pos"][:, 1],
+                z=data[0]["alt"],
+                hovertext=[f'team {swarm}' for swarm in data[0]["swarm"]],
                 hoverinfo="text",
                 mode="markers",
                 name=f'Particle',
                 marker=dict(
-                    color=[Color(colors[particle_info.get("swarm")], luminance=0.3).get_hex() if particle_info.get(
-                        "best") else colors[particle_info.get("swarm")] for particle_info in data.get(0)],
+                    color=[Color(colors[particle_info["swarm"]], luminance=0.3).get_hex() if particle_info[
+                        "best"] else colors[particle_info["swarm"]] for particle_info in data[0]],
                     size=10)
             ),
             row=1, col=1
@@ -54,18 +54,18 @@ class Visualizer:
 
         fig = fig.add_trace(
             go.Scatter3d(
-                x=[data.get(0)[i].get("pos")[0] for i in range(len(data.get(0)))],
-                y=[data.get(0)[i].get("pos")[1] for i in range(len(data.get(0)))],
-                z=[-2.5 for _ in range(len(data.get(0)))],
-                hovertext=[f'team {data.get(0)[i].get("swarm")}' for i in range(len(data.get(0)))],
+                x=data[0]["pos"][:, 0],
+                y=data[0]["pos"][:, 1],
+                z=[-2.5 for _ in range(len(data[0]))],
+                hovertext=[f'team {swarm}' for swarm in data[0]["swarm"]],
                 hoverinfo="text",
                 mode="markers",
                 showlegend=False,
                 marker=dict(
                     color=[
-                        Color(colors[particle_info.get("swarm")], luminance=0.3).get_hex()
-                        if particle_info.get("best") else colors[particle_info.get("swarm")]
-                        for particle_info in data.get(0)],
+                        Color(colors[particle_info["swarm"]], luminance=0.3).get_hex()
+                        if particle_info["best"] else colors[particle_info["swarm"]]
+                        for particle_info in data[0]],
                     size=5)
             ),
             row=1, col=1
@@ -144,26 +144,26 @@ class Visualizer:
     def get_current_data_frame(self, gen, data, line_data):
         ret_list = [
             go.Scatter3d(
-                x=[data.get(gen)[i].get("pos")[0] for i in range(len(data.get(gen)))],
-                y=[data.get(gen)[i].get("pos")[1] for i in range(len(data.get(gen)))],
-                z=[data.get(gen)[i].get("alt") for i in range(len(data.get(gen)))],
-                hovertext=[f'team {data.get(gen)[i].get("swarm")}' for i in range(len(data.get(0)))],
+                x=data[gen]["pos"][:, 0],
+                y=data[gen]["pos"][:, 1],
+                z=data[gen]["alt"],
+                hovertext=[f'team {swarm}' for swarm in data[gen]["swarm"]],
                 hoverinfo="text",
                 mode="markers",
                 marker=dict(
-                    color=[Color(colors[particle_info.get("swarm")], luminance=0.3).get_hex() if particle_info.get(
-                        "best") else colors[particle_info.get("swarm")] for particle_info in data.get(gen)],
+                    color=[Color(colors[particle_info["swarm"]], luminance=0.3).get_hex() if particle_info[
+                        "best"] else colors[particle_info["swarm"]] for particle_info in data[gen]],
                     size=10)),
             go.Scatter3d(
-                x=[data.get(gen)[i].get("pos")[0] for i in range(len(data.get(gen)))],
-                y=[data.get(gen)[i].get("pos")[1] for i in range(len(data.get(gen)))],
-                z=[-2.5 for _ in range(len(data.get(gen)))],
-                hovertext=[f'team {data.get(gen)[i].get("swarm")}' for i in range(len(data.get(0)))],
+                x=data[gen]["pos"][:, 0],
+                y=data[gen]["pos"][:, 1],
+                z=[-2.5 for _ in range(len(data[gen]))],
+                hovertext=[f'team {swarm}' for swarm in data[gen]["swarm"]],
                 hoverinfo="text",
                 mode="markers",
                 marker=dict(
-                    color=[Color(colors[particle_info.get("swarm")], luminance=0.3).get_hex() if particle_info.get(
-                        "best") else colors[particle_info.get("swarm")] for particle_info in data.get(gen)],
+                    color=[Color(colors[particle_info["swarm"]], luminance=0.3).get_hex() if particle_info[
+                        "best"] else colors[particle_info["swarm"]] for particle_info in data[gen]],
                     size=5))
         ]
 
@@ -5,8 +5,8 @@ import pygame
 
 from src.simulator.Line import Line
 from src.simulator.Room import Room
-from src.utils.Constants import PADDING, WIDTH, HEIGHT, ROBOT_RADIUS, PADDING_TOP, EPSILON
-from src.utils.MathUtils import distance_point_to_point, distance_point_to_line_seg, line_seg_intersection, outside_of_line
+from src.utils.Constants import PADDING, WIDTH, HEIGHT, ROBOT_RADIUS, PADDING_TOP, EPSILON, RNG
+from src.utils.MathUtils import collide_all, outside_of_line, distance_point_to_line_seg
 
 # This class was mostly created by Guillaume
 
@@ -33,39 +33,62 @@ class Environment:
             line.draw(screen)
 
     def collides(self, robot_current_center: np.ndarray, robot_next_center: np.ndarray) -> List[Collision]:
-        collisions = []
-
-        for line in self.environment.map:
-
-            distance_to_line = distance_point_to_line_seg(robot_next_center, line.start, line.end)
-            extend_intersection = line_seg_intersection(robot_current_center, robot_next_center, line.col_start, line.col_end)
-            true_intersection = line_seg_intersection(robot_current_center, robot_next_center, line.start, line.end)
-            jumped_through = False
-            if extend_intersection is not None:
-                jumped_through = distance_point_to_point(robot_current_center, robot_next_center) > distance_point_to_point(
-                    robot_current_center, extend_intersection)
-
-            # We need this because otherwise we would stop at the extended line of a
-            if extend_intersection is not None and true_intersection is None and np.abs(np.dot((robot_current_center - robot_next_center).T, line.vec)) < EPSILON:
-                continue
-
-            if (ROBOT_RADIUS - distance_to_line > EPSILON) or jumped_through:
-                collisions.append(Collision(
-                    line,
-                    outside_of_line(robot_current_center, line.start, line.end),
-                    true_intersection,
-                    extend_intersection,
-                    jumped_through,
-                    distance_to_line
-                ))
-        return collisions
+        geometry = self.collision_geometry(robot_current_center, robot_next_center)
+        return [self.create_collision(i, robot_current_center, geometry) for i in np.flatnonzero(geometry[0])]
+
+    def closest_collision(self, robot_current_center: np.ndarray, robot_next_center: np.ndarray) -> Collision:
+        """
+        Collision whose line is closest to the current position, None if there is no collision.
+        Only the closest one is turned into a Collision, on equal distances the last line of the map wins.
+        """
+        geometry = self.collision_geometry(robot_current_center, robot_next_center)
+
+        minimum = np.inf
+        closest = None
+        for i in np.flatnonzero(geometry[0]):
+            line = self.environment.map[i]
+            dist = distance_point_to_line_seg(robot_current_center, line.start, line.end)
+            if dist <= minimum:
+                minimum = dist
+                closest = i
+        return None if closest is None else self.create_collision(closest, robot_current_center, geometry)
+
+    def collision_geometry(self, robot_current_center: np.ndarray, robot_next_center: np.ndarray) -> tuple:
+        room = self.environment
+        # Positions can be (2, 1) arrays or np.matrix (turning robot), the kernel needs flat (2,) vectors
+        current = np.asarray(robot_current_center, dtype=np.float32).ravel()
+        following = np.asarray(robot_next_center, dtype=np.float32).ravel()
+
+        # Check every line of the room at once
+        distances, true_points, extend_points, true_mask, extend_mask, jumped_through = collide_all(
+            current, following, room.starts, room.vecs, room.inv_len_sq, room.col_starts, room.col_vecs
+        )
+
+        # We need this because otherwise we would stop at the extended line of a
+        parallel = extend_mask & ~true_mask & (np.abs(room.vecs @ (current - following)) < EPSILON)
+
+        collision_mask = ~parallel & ((ROBOT_RADIUS - distances > EPSILON) | jumped_through)
+        return collision_mask, distances, true_points, extend_points, true_mask, extend_mask, jumped_through
+
+    def create_collision(self, i: int, robot_current_center: np.ndarray, geometry: tuple) -> Collision:
+        # Collision objects are only created for the lines that collide
+        _, distances, true_points, extend_points, true_mask, extend_mask, jumped_through = geometry
+        line = self.environment.map[i]
+        return Collision(
+            line,
+            outside_of_line(robot_current_center, line.start, line.end),
+            true_points[i].reshape((2, 1)) if true_mask[i] else None,
+            extend_points[i].reshape((2, 1)) if extend_mask[i] else None,
+            bool(jumped_through[i]),
+            distances[i]
+        )
 
     def get_random_pos(self):
         # todo check for intersection with environment
         return np.array([
-            np.random.randint(low = PADDING + ROBOT_RADIUS, high = WIDTH - PADDING - ROBOT_RADIUS),
-            np.random.randint(low = PADDING_TOP + ROBOT_RADIUS, high = HEIGHT - PADDING - ROBOT_RADIUS),
-        ]).reshape((2, 1))
+            RNG.integers(low = PADDING + ROBOT_RADIUS, high = WIDTH - PADDING - ROBOT_RADIUS),
+            RNG.integers(low = PADDING_TOP + ROBOT_RADIUS, high = HEIGHT - PADDING - ROBOT_RADIUS),
+        ], dtype=np.float32).reshape((2, 1))
 
 
 # Collision Test
@@ -32,6 +32,8 @@ class Line:
         self.col_end_y: float = self.col_end[1].item()
 
         self.length = np.linalg.norm(self.vec)
+        self.len_sq: float = (self.vec.T @ self.vec).item()                       # Squared length, cached for the collision test
+        self.inv_len_sq: float = 1.0 / self.len_sq if self.len_sq > 0 else 0.0
         self.angle = self.compute_slope()
 
         if DRAW:
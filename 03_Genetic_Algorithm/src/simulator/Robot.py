@@ -77,12 +77,11 @@ class Robot:
 
     def check_collisions(self, environment: Environment, current_pos: np.ndarray, next_pos: np.ndarray,
                          prev_collision: List[Collision]) -> np.ndarray:
-        collisions = environment.collides(current_pos, next_pos)
-        if len(collisions) == 0 or get_x_y(next_pos) == (0, 0):
+        closest_line = environment.closest_collision(current_pos, next_pos)
+        if closest_line is None or get_x_y(next_pos) == (0, 0):
             return next_pos
         else:
             self.number_of_total_collisions += 1
-            closest_line = self.closest_collision(collisions, current_pos)
             t_current_pos, t_next_pos = self.recalc_next_pos(current_pos, next_pos, closest_line)
             # if self.recalc_next_pos(current_pos, next_pos, closest_line)[1].shape == (2,2):
             #     t_current_pos, t_next_pos = self.recalc_next_pos(current_pos, next_pos, closest_line)
@@ -195,16 +194,13 @@ class Robot:
         vec = self.pos + rotated
         return vec[0, 0], vec[1, 0]
 
-    @staticmethod
-    def closest_collision(collisions: List[Collision], position) -> Collision:
-        minimum = np.inf
-        closest = None
 
-        for collision in collisions:
-            line_: Line = collision.line
-            dist = distance_point_to_line_seg(position, line_.start, line_.end)
 
-            if dist <= minimum:
-                minimum = dist
-                closest = collision
-        return closest
+# Turning Test
+if __name__ == '__main__':
+    e = Environment()
+    # Different weights per wheel make the robot turn, its position update is then computed as np.matrix
+    robot = Robot(e.environment.initial_random_pos, 0, Genome(np.concatenate((np.zeros(14), np.ones(14)))))
+    for _ in range(10):
+        robot.update(e)
+    print(robot.v_r != robot.v_l, get_x_y(robot.pos))
\ No newline at end of file
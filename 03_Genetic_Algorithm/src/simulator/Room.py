@@ -13,12 +13,21 @@ class Room:
         self.initial_random_pos: np.ndarray = rooms[room][1]
         self.dust: np.ndarray = self.generate_dust()
 
+        # Line coordinates stacked as (M, 2) float32 arrays so collisions can be checked against all lines at once
+        self.starts: np.ndarray = np.array([line.start.reshape(2) for line in self.map], dtype=np.float32)
+        self.ends: np.ndarray = np.array([line.end.reshape(2) for line in self.map], dtype=np.float32)
+        self.col_starts: np.ndarray = np.array([line.col_start.reshape(2) for line in self.map], dtype=np.float32)
+        self.col_ends: np.ndarray = np.array([line.col_end.reshape(2) for line in self.map], dtype=np.float32)
+        self.vecs: np.ndarray = np.array([line.vec.reshape(2) for line in self.map], dtype=np.float32)
+        self.col_vecs: np.ndarray = self.col_ends - self.col_starts
+        self.inv_len_sq: np.ndarray = np.array([line.inv_len_sq for line in self.map], dtype=np.float32)
+
     @staticmethod
     def generate_dust() -> np.ndarray:
         n = int(MAP_WIDTH * MAP_HEIGHT / ROBOT_RADIUS)
         xy_min = ORIGIN
         xy_max = [MAP_WIDTH, MAP_HEIGHT]
-        return np.random.uniform(low=xy_min, high=xy_max, size=(n, 2))
+        return RNG.uniform(low=xy_min, high=xy_max, size=(n, 2))
 
 
 default_boundaries = [
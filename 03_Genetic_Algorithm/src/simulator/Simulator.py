@@ -7,10 +7,23 @@ import numpy as np
 
 
 from src.simulator.Robot import Robot
-from src.utils.Constants import WIDTH, HEIGHT, LIFE_STEPS, FPS, COLORS, DRAW
+from src.utils.Constants import WIDTH, HEIGHT, LIFE_STEPS, FPS, COLORS, DRAW, RNG
 from src.simulator.Environment import Environment
 from src.genetic.Population import Population
 
+
+worker_environment: Environment = None  # Environment of the current worker process, built once by init_worker
+
+
+def init_worker():
+    global worker_environment
+    worker_environment = Environment()
+
+
+def run_worker_robot_evaluation(generations, robot) -> float:
+    return Simulator.run_robot_evaluation(generations, robot, worker_environment)
+
+
 class Simulator:
     """
     Author Frederic Abraham
@@ -40,11 +53,12 @@ class Simulator:
             ]
             self.FONT = pygame.font.SysFont(None, 28)  # Font used for data visualization on top
         else:
-            self.pool = ProcessPoolExecutor(os.cpu_count())
+            self.pool = ProcessPoolExecutor(os.cpu_count(), initializer = init_worker)
 
         self.environment: Environment = Environment()                               # Environment where the robot is placed
         self.done: bool = False                                                     # Window closed ?
         self.robots: List[Robot] = []
+        self.population: Population = None                                          # Population whose fitness is being evaluated
         self.simulation_time = simulation_time
         self.time_left = simulation_time
 
@@ -53,16 +67,17 @@ class Simulator:
         self.robots.clear()
         for individual in range(robo_amount):
             self.robots.append(
-                Robot(init_pos = self.environment.environment.initial_random_pos, init_rotation = np.random.randint(low=0, high=360), genome = None)
+                Robot(init_pos = self.environment.environment.initial_random_pos, init_rotation = RNG.integers(low=0, high=360), genome = None)
             )
 
     def set_population(self, population: Population):
         self.time_left = self.simulation_time
         self.robots.clear()
         self.done = False
+        self.population = population
         for individual in population.individuals:
             self.robots.append(
-                Robot(init_pos = self.environment.environment.initial_random_pos, init_rotation = np.random.randint(low=0, high=360), genome = individual)
+                Robot(init_pos = self.environment.environment.initial_random_pos, init_rotation = RNG.integers(low=0, high=360), genome = individual)
             )
 
     def start(self) -> None:
@@ -76,17 +91,20 @@ class Simulator:
                 self.update()
                 self.draw()
                 self.clock.tick(FPS)
+
+            for i, robot in enumerate(self.robots):
+                self.population.fitness[i] = robot.genome.fitness
         else:
             futures = []
-            environment = self.environment
             for robot in self.robots:
-                # self.run_robot_evaluation(self.time_left, robot, environment)
-                future = self.pool.submit(self.run_robot_evaluation, self.time_left, robot, environment)
+                # self.run_robot_evaluation(self.time_left, robot, self.environment)
+                future = self.pool.submit(run_worker_robot_evaluation, self.time_left, robot)
                 futures.append(dict(future=future, robot=robot))
 
-            for future in futures:
+            for i, future in enumerate(futures):
                 future["future"].done()
                 future["robot"].genome.fitness = future["future"].result()
+                self.population.fitness[i] = future["robot"].genome.fitness
             # print("Future Done")
 
     @staticmethod
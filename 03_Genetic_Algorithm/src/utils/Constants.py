@@ -1,4 +1,5 @@
 import numpy as np
+from numpy.random import default_rng
 
 # This was done by everyone piece by piece
 
@@ -9,6 +10,8 @@ from src.optimization_function.OptimizationFunction import OptimizationFunction
 Author Frederic Abraham, Guillaume Franzoni Darnois & Theodoros Giannilias
 """
 
+RNG = default_rng()  # Random generator shared by the whole application
+
 ENVIRONMENT_SPEED = 0.1  # Frederic fill this please
 PADDING = 20  # Right, Left and Bottom padding
 PADDING_TOP = 100  # Top padding to make space for data
@@ -54,11 +57,17 @@ N_INDIVIDUALS = 50
 CROSSOVER_MUTATION_PERCENTAGE = 0.5
 SELECT_PERCENTAGE = 0.4
 ELITISM_PERCENTAGE = 0.1
+ELITE_N = int(N_INDIVIDUALS * ELITISM_PERCENTAGE)                  # Individuals kept as elite every generation
+SELECT_N = int(N_INDIVIDUALS * SELECT_PERCENTAGE)                  # Individuals picked by the roulette wheel
+XMUT_N = int(N_INDIVIDUALS * CROSSOVER_MUTATION_PERCENTAGE)        # Children created by crossover and mutation
 
 MUTATION_PROBABILITY = 0.08
 
 GENOME_LENGTH = (NUMBER_OF_SENSORS + 2) * 2   # Number of sensors * Number of components of the velocity
 N_GENERATION = 100
+N_SWARMS = 1  # Number of islands (sub populations) evolved in parallel processes, 1 evolves a single population
+MIGRATION_INTERVAL = 10  # Generations between two migrations of the best individuals to the next island
+MIGRATION_SIZE = 2  # Number of best individuals sent to the next island
 GRAPH_WINDOW = -1
 DRAW = True
 
@@ -67,6 +76,7 @@ SEARCH_SPACE = 10
 VALUES_PER_AXIS = 10
 optimisation = OptimizationFunction(0, 100)
 OPTI_FUNC = optimisation.rosenbrock
+OPTI_FUNC_VEC = optimisation.rosenbrock_batch  # Same function evaluated on a whole population at once
 GENOME_LENGTH = VALUES_PER_AXIS * 2  # for two dimension
 
 # ---PARTICLE consts
@@ -1,6 +1,7 @@
 import math
 
 import numpy as np
+from numba import njit
 from shapely.geometry import LineString
 import src.utils.Constants as Const
 from src.simulator.Line import Line
@@ -117,6 +118,71 @@ def distance_point_to_line_seg(p: np.ndarray, s: np.ndarray, e: np.ndarray) -> f
     return np.linalg.norm(np.cross(s - e, s - p, axis=0)) / np.linalg.norm(e - s)
 
 
+def collide_all(p0: np.ndarray, p1: np.ndarray, starts: np.ndarray, vecs: np.ndarray, inv_len_sq: np.ndarray,
+                col_starts: np.ndarray, col_vecs: np.ndarray):
+    """
+    Geometry of the movement p0 -> p1 against every line, returns per line: distance of p1 to the line,
+    true intersection, extended intersection, masks telling which intersections exist and jumped through
+    """
+    # The kernel only accepts flat (2,) points, positions are (2, 1) arrays or np.matrix
+    return collide_all_kernel(np.asarray(p0).ravel(), np.asarray(p1).ravel(), starts, vecs, inv_len_sq,
+                              col_starts, col_vecs)
+
+
+@njit(cache=True, fastmath=True)
+def collide_all_kernel(p0: np.ndarray, p1: np.ndarray, starts: np.ndarray, vecs: np.ndarray, inv_len_sq: np.ndarray,
+                       col_starts: np.ndarray, col_vecs: np.ndarray):
+    m = starts.shape[0]
+    distances = np.empty(m)
+    true_intersections = np.zeros((m, 2))
+    extend_intersections = np.zeros((m, 2))
+    has_true = np.zeros(m, dtype=np.bool_)
+    has_extend = np.zeros(m, dtype=np.bool_)
+    jumped = np.zeros(m, dtype=np.bool_)
+
+    dx = p1[0] - p0[0]
+    dy = p1[1] - p0[1]
+
+    for i in range(m):
+        # Distance from the next position to the line segment
+        ex = vecs[i, 0]
+        ey = vecs[i, 1]
+        t = ((p1[0] - starts[i, 0]) * ex + (p1[1] - starts[i, 1]) * ey) * inv_len_sq[i]
+        t = min(max(t, 0.0), 1.0)
+        cx = p1[0] - (starts[i, 0] + t * ex)
+        cy = p1[1] - (starts[i, 1] + t * ey)
+        distances[i] = np.sqrt(cx * cx + cy * cy)
+
+        # Intersection with the line itself
+        denominator = dx * ey - dy * ex
+        if denominator != 0:
+            sx = starts[i, 0] - p0[0]
+            sy = starts[i, 1] - p0[1]
+            t = (sx * ey - sy * ex) / denominator
+            u = (sx * dy - sy * dx) / denominator
+            if 0 <= t <= 1 and 0 <= u <= 1:
+                has_true[i] = True
+                true_intersections[i, 0] = p0[0] + t * dx
+                true_intersections[i, 1] = p0[1] + t * dy
+
+        # Intersection with the line extended by the radius on both ends
+        ex = col_vecs[i, 0]
+        ey = col_vecs[i, 1]
+        denominator = dx * ey - dy * ex
+        if denominator != 0:
+            sx = col_starts[i, 0] - p0[0]
+            sy = col_starts[i, 1] - p0[1]
+            t = (sx * ey - sy * ex) / denominator
+            u = (sx * dy - sy * dx) / denominator
+            if 0 <= t <= 1 and 0 <= u <= 1:
+                has_extend[i] = True
+                extend_intersections[i, 0] = p0[0] + t * dx
+                extend_intersections[i, 1] = p0[1] + t * dy
+                jumped[i] = t < 1  # The extended line lies before the next position
+
+    return distances, true_intersections, extend_intersections, has_true, has_extend, jumped
+
+
 # from: https://gist.github.com/nim65s/5e9902cd67f094ce65b0
 def outside_of_line(p: np.ndarray, s: np.ndarray, e: np.ndarray) -> (np.ndarray, np.ndarray):
     if all(s == p) or all(e == p):